@@ -87,6 +87,18 @@ class ChatMessage(BaseModel):
             raise ValueError('Timestamp must be a positive integer')
         return v
 
+    @classmethod
+    def trusted(cls, id: str, role: str, content: str, timestamp: int, isTyping: bool = False) -> "ChatMessage":
+        """
+        Build a message from already-validated values, skipping the
+        validator pipeline. Only for internal paths where the fields are
+        known good (e.g. messages the backend constructs itself); data
+        from the wire must go through normal validation.
+        """
+        return cls.model_construct(
+            id=id, role=role, content=content, timestamp=timestamp, isTyping=isTyping
+        )
+
 class ChatFeedbackRequest(BaseModel):
     problemId: str
     userSolution: List[str]
@@ -1,3 +1,6 @@
+import asyncio
+import copy
+import functools
 import os
 import openai
 from dotenv import load_dotenv
@@ -304,6 +307,29 @@ TECHNICAL EXPERTISE:
             chat_history
         )
 
+async def generate_chat_response_async(
+    problem_settings: Dict[str, Any],
+    user_solution: List[str],
+    chat_history: List[Dict[str, Any]],
+    current_message: str,
+    solution_context: Dict[str, Any] = None
+) -> str:
+    """
+    Async counterpart of generate_chat_response.
+
+    Runs the synchronous pipeline in a worker thread so independent chat
+    requests can be fanned out with asyncio.gather, overlapping their
+    OpenAI round-trips instead of paying them sequentially.
+    """
+    return await asyncio.to_thread(
+        generate_chat_response,
+        problem_settings,
+        user_solution,
+        chat_history,
+        current_message,
+        solution_context,
+    )
+
 def analyze_solution_state_enhanced(problem_settings: Dict[str, Any], user_solution: List[str], solution_context=None) -> Dict[str, Any]:
     """
     Enhanced analysis of the current state of the student's solution with detailed problem context.
@@ -405,6 +431,37 @@ def analyze_solution_state_enhanced(problem_settings: Dict[str, Any], user_solut
     
     return analysis
 
+@functools.lru_cache(maxsize=256)
+def _analyze_cached(problem_initial: str, solution_tuple: tuple) -> Dict[str, Any]:
+    """
+    Cached core of analyze_solution_state keyed on problem text and
+    solution lines, since chat flows and tests re-analyze the same
+    problem/solution pairs repeatedly.
+    """
+    analysis = analyze_solution_state_enhanced(
+        {"initial": problem_initial}, list(solution_tuple)
+    )
+    # The original analysis exposed these two summary flags directly
+    analysis["has_solution"] = len(solution_tuple) > 0
+    analysis["is_complete"] = (
+        analysis.get("solution_length", 0) >= analysis.get("expected_length", 0)
+        and analysis.get("expected_length", 0) > 0
+    )
+    return analysis
+
+def analyze_solution_state(problem_settings: Dict[str, Any], user_solution: List[str]) -> Dict[str, Any]:
+    """
+    Analyzes the current state of the student's solution.
+    This is the ORIGINAL analysis function - preserved for backwards compatibility.
+    """
+    if isinstance(problem_settings, dict):
+        initial = problem_settings.get("initial", "")
+    else:
+        initial = getattr(problem_settings, "initial", "")
+    cached = _analyze_cached(initial, tuple(user_solution))
+    # Deep copy so callers can mutate their result without poisoning the cache
+    return copy.deepcopy(cached)
+
 def analyze_code_structure(user_solution: List[str], correct_solution: List[str]) -> Dict[str, Any]:
     """
     Analyzes the structural aspects of the code.
@@ -460,6 +517,17 @@ def build_conversation_context_enhanced(chat_history: List[Dict[str, Any]]) -> D
     
     return context
 
+def build_conversation_context(chat_history: List[Dict[str, Any]]) -> str:
+    """
+    Builds a plain-text transcript of the conversation.
+    This is the ORIGINAL context function - preserved for backwards compatibility.
+    """
+    # Single join over a prebuilt list; no quadratic += accumulation
+    parts = [None] * len(chat_history)
+    for i, message in enumerate(chat_history):
+        parts[i] = f"{message.get('role', 'unknown')}: {message.get('content', '')}"
+    return "\n".join(parts)
+
 def determine_conversation_stage(chat_history: List[Dict[str, Any]]) -> str:
     """Determine what stage of conversation we're in."""
     message_count = len(chat_history)
@@ -619,17 +687,19 @@ def generate_conversation_summary(chat_history: List[Dict[str, Any]]) -> str:
     topics = extract_topics_discussed(chat_history)
     understanding = assess_student_understanding(chat_history)
     
-    summary = f"We've discussed {len(topics)} main topic(s)"
+    # Collect the fragments and join once instead of growing the string
+    parts = [f"We've discussed {len(topics)} main topic(s)"]
     if topics:
-        summary += f" including {', '.join(topics[:3])}"
+        parts.append(f" including {', '.join(topics[:3])}")
         if len(topics) > 3:
-            summary += f" and {len(topics) - 3} more"
-    
-    summary += f". The student seems to be {understanding}"
+            parts.append(f" and {len(topics) - 3} more")
+
+    parts.append(f". The student seems to be {understanding}")
     if understanding != "unknown":
-        summary += " with the concepts"
-    
-    summary += f". We've exchanged {len(chat_history)} messages total."
+        parts.append(" with the concepts")
+
+    parts.append(f". We've exchanged {len(chat_history)} messages total.")
+    summary = "".join(parts)
     
     return summary
 
@@ -1066,39 +1136,71 @@ def generate_fallback_feedback(correct_lines: List[str], user_solution: List[str
     # Should not reach here if validation determined the solution is incorrect
     return "I see some issues with your solution. Can you review the logical flow of your program? What should happen first, and what operations follow?"
 
-def generate_chat_fallback(current_message: str, user_solution: List[str], problem_settings: Dict[str, Any]) -> str:
-    """
-    Generates a helpful fallback response when the AI API is unavailable.
-    This is the ORIGINAL chat fallback function - preserved for backwards compatibility.
-    """
-    message_lower = current_message.lower()
-    
-    # Analyze what the student is asking about
-    if 'indent' in message_lower:
+# All fallback-topic keywords compiled into one pattern so the message is
+# scanned once instead of once per keyword; the lookahead collects
+# overlapping occurrences so substring semantics match the old 'in' checks
+_FALLBACK_TOPIC_RE = re.compile(
+    r'(?=(indent|order|sequence|function|def|loop|for|help|confused|stuck|start|begin))'
+)
+
+def _classify_fallback_topic(message_lower: str) -> str:
+    """Canonicalize a student message to the fallback topic it triggers."""
+    topics = {m.group(1) for m in _FALLBACK_TOPIC_RE.finditer(message_lower)}
+
+    # Same priority order as the original if/elif chain
+    if 'indent' in topics:
+        return 'indent'
+    if 'order' in topics or 'sequence' in topics:
+        return 'order'
+    if 'function' in topics or 'def' in topics:
+        return 'function'
+    if 'loop' in topics or 'for' in topics:
+        return 'loop'
+    if 'help' in topics or 'confused' in topics or 'stuck' in topics:
+        return 'help'
+    if 'start' in topics or 'begin' in topics:
+        return 'start'
+    return 'generic'
+
+@functools.lru_cache(maxsize=512)
+def _fallback_by_topic(topic: str, has_solution: bool) -> str:
+    """Static fallback template for a (topic, solution-present) pair."""
+    if topic == 'indent':
         return "Indentation in Python shows which lines belong together. Lines that are part of the same block (like inside a function or if statement) should have the same indentation. What part of indentation are you finding confusing?"
-    
-    elif 'order' in message_lower or 'sequence' in message_lower:
+
+    elif topic == 'order':
         return "Code order is important! Think about what needs to happen first in your program. What do you think should be the very first step?"
-    
-    elif 'function' in message_lower or 'def' in message_lower:
+
+    elif topic == 'function':
         return "Functions are defined with 'def' and contain code that runs when the function is called. What do you want to know about functions in this problem?"
-    
-    elif 'loop' in message_lower or 'for' in message_lower:
+
+    elif topic == 'loop':
         return "Loops repeat code multiple times. The code inside the loop should be indented. What's confusing you about the loop in this problem?"
-    
-    elif 'help' in message_lower or 'confused' in message_lower or 'stuck' in message_lower:
-        if len(user_solution) == 0:
+
+    elif topic == 'help':
+        if not has_solution:
             return "I'm here to help! Start by dragging some code blocks to the solution area. What do you think should go first?"
         else:
             return "Let's work through this step by step. Look at your current arrangement - does the order make logical sense for what the program should do?"
-    
-    elif 'start' in message_lower or 'begin' in message_lower:
+
+    elif topic == 'start':
         return "Great question! Think about what a program needs to do first. Usually, that means setting up variables or defining functions. What do you see in the code blocks that might need to happen first?"
-    
+
     else:
         # Generic helpful response
         return "I'm here to help you with this Python problem! Can you tell me more specifically what you're trying to figure out? I can help with code order, indentation, or Python concepts."
 
+def generate_chat_fallback(current_message: str, user_solution: List[str], problem_settings: Dict[str, Any]) -> str:
+    """
+    Generates a helpful fallback response when the AI API is unavailable.
+    This is the ORIGINAL chat fallback function - preserved for backwards compatibility.
+
+    The responses are static templates, so repeat messages resolve to a
+    cached string keyed by (topic, has_solution) without rescanning.
+    """
+    topic = _classify_fallback_topic(current_message.lower())
+    return _fallback_by_topic(topic, bool(user_solution))
+
 # Unified OpenAI chat completion for both v1.x and pre-v1.0 clients
 
 def get_openai_response(messages, max_tokens=200, temperature=0.7, **kwargs):
@@ -1,7 +1,69 @@
-from typing import Dict, List, Any, Optional
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from sys import intern
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from .validation_engine import validation_engine
 
+logger = logging.getLogger(__name__)
+
+# Matches the distractor marker comment, compiled once per process
+_DISTRACTOR_RE = re.compile(r'#\s*distractor\b')
+
+# Leading indentation of every line in a block, extracted in one
+# multiline pass; [ \t] mirrors what lstrip() removes from code lines
+_LEADING_WS_RE = re.compile(r'^[ \t]*', re.M)
+
+
+# Programming concepts and their marker keywords, shared across calls
+_CONCEPT_DEFINITIONS = {
+    "functions": {"keywords": ("def ", "return"), "description": "function definition"},
+    "loops": {"keywords": ("for ", "while "), "description": "iteration/loops"},
+    "conditionals": {"keywords": ("if ", "else", "elif"), "description": "conditional logic"},
+    "variables": {"keywords": ("=",), "description": "variable assignment"},
+    "output": {"keywords": ("print(",), "description": "output/printing"},
+    "input": {"keywords": ("input(",), "description": "user input"},
+    "lists": {"keywords": ("[", "]", ".append", ".extend"), "description": "list operations"},
+    "strings": {"keywords": ("'", '"', ".format", "f'"), "description": "string handling"}
+}
+
+# All concept keywords in a single alternation; the lookahead form captures
+# overlapping occurrences so presence checks keep substring semantics.
+# Longest-first ordering prevents same-position shadowing.
+_KEYWORD_RE = re.compile('(?=({}))'.format('|'.join(
+    re.escape(keyword)
+    for keyword in sorted(
+        {k for details in _CONCEPT_DEFINITIONS.values() for k in details["keywords"]},
+        key=len, reverse=True
+    )
+)))
+
+
+def _keywords_present(text: str) -> set:
+    """
+    The set of concept keywords occurring in text, found in one scan.
+    """
+    return {match.group(1) for match in _KEYWORD_RE.finditer(text)}
+
+
+@lru_cache(maxsize=128)
+def _extract_correct_lines_cached(initial_code: str) -> Tuple[str, ...]:
+    """
+    Parse the correct solution lines out of an initial-code string once
+    per distinct problem; stored as a tuple so the cached value is
+    immutable.
+    """
+    return tuple(
+        line for line in initial_code.split('\n')
+        if line.strip() and not _DISTRACTOR_RE.search(line)
+    )
+
 class SharedValidationService:
     """
     Centralized validation service that provides consistent validation logic
@@ -24,22 +86,9 @@ class SharedValidationService:
         """
         # Handle both dictionary and object access
         initial_code = problem_settings.get("initial") if isinstance(problem_settings, dict) else problem_settings.initial
-        correct_lines = []
-        
-        # Process each line in the initial code
-        for line in initial_code.split('\n'):
-            # Skip empty lines
-            if not line.strip():
-                continue
-            
-            # Skip distractor lines (marked with #distractor)
-            if '#distractor' in line:
-                continue
-            
-            # Add this line to the correct solution (PRESERVE INDENTATION)
-            correct_lines.append(line)  # Don't strip here
-        
-        return correct_lines
+        # Parsing is cached per initial-code string (indentation preserved);
+        # return a fresh list so callers are free to mutate it
+        return list(_extract_correct_lines_cached(initial_code))
     
     @staticmethod
     def clean_user_solution(user_solution: List[str]) -> List[str]:
@@ -66,49 +115,60 @@ class SharedValidationService:
         Returns:
             Dictionary containing indentation analysis results
         """
-        indentation_result = {
-            "has_indentation_issues": False,
-            "indentation_errors": [],
-            "specific_issues": []
-        }
-        
-        try:
-            # Only check if we have solutions to compare
-            if not user_solution or not correct_lines:
-                return indentation_result
-            
-            min_length = min(len(user_solution), len(correct_lines))
-            
-            for i in range(min_length):
-                user_line = user_solution[i]
-                correct_line = correct_lines[i]
-                
+        # Error lists are allocated lazily — the common "no issues" outcome
+        # builds no intermediate lists at all. Each call returns fresh lists
+        # because callers extend/append to them in place.
+        indentation_errors: Optional[List[Dict[str, Any]]] = None
+        specific_issues: Optional[List[str]] = None
+
+        # Only check if we have solutions to compare. zip() stops at the
+        # shorter list, and each stripped form is computed exactly once.
+        if user_solution and correct_lines:
+            # One anchored regex match per element measures the indent
+            # without the stripped-copy allocation of len - len(lstrip).
+            # Elements are matched individually rather than joined into
+            # one block: multi-line Parsons blocks can embed newlines,
+            # which would desynchronize a joined-text scan.
+            _indent_of = _LEADING_WS_RE.match
+            user_indents = [_indent_of(line).end() for line in user_solution]
+            correct_indents = [_indent_of(line).end() for line in correct_lines]
+
+            for i, (user_line, correct_line) in enumerate(zip(user_solution, correct_lines)):
                 # Skip if content doesn't match (handle content vs indentation separately)
-                if user_line.strip() != correct_line.strip():
+                user_content = user_line.strip()
+                if user_content != correct_line.strip():
                     continue
-                
+
                 # Check indentation
-                user_indent = len(user_line) - len(user_line.lstrip())
-                correct_indent = len(correct_line) - len(correct_line.lstrip())
-                
+                user_indent = user_indents[i]
+                correct_indent = correct_indents[i]
+
                 if user_indent != correct_indent:
-                    indentation_result["has_indentation_issues"] = True
-                    indentation_result["indentation_errors"].append({
+                    if indentation_errors is None:
+                        indentation_errors = []
+                        specific_issues = []
+                    indentation_errors.append({
                         "line_index": i,
                         "user_indent": user_indent,
                         "correct_indent": correct_indent,
-                        "line_content": user_line.strip()
+                        "line_content": user_content
                     })
-                    indentation_result["specific_issues"].append(
+                    specific_issues.append(
                         f"Line {i + 1}: Expected {correct_indent} spaces, got {user_indent} spaces"
                     )
-        
-        except Exception as e:
-            # Log error but don't fail the validation
-            print(f"Indentation check error: {e}")
-            indentation_result["has_indentation_issues"] = False
-        
-        return indentation_result
+
+        if indentation_errors is None:
+            return {
+                "has_indentation_issues": False,
+                "indentation_errors": [],
+                "specific_issues": []
+            }
+
+        return {
+            "has_indentation_issues": True,
+            "indentation_errors": indentation_errors,
+            "specific_issues": specific_issues
+        }
     
     @staticmethod
     def validate_solution_complete(
@@ -117,8 +177,58 @@ class SharedValidationService:
         solution_context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
-        Complete solution validation using unified engine
+        Complete solution validation using unified engine.
+
+        Results for context-free validations are memoized by content
+        (initial code + user lines), so repeated submissions of the same
+        solution skip the whole pipeline.
         """
+        if solution_context is None:
+            if isinstance(problem_settings, dict):
+                initial = problem_settings.get("initial", "")
+                options = problem_settings.get("options", {}) or {}
+                can_indent = options.get("can_indent", True) if isinstance(options, dict) else getattr(options, "can_indent", True)
+            else:
+                initial = problem_settings.initial
+                can_indent = getattr(getattr(problem_settings, "options", None), "can_indent", True)
+            cached = _validate_complete_cached(initial, can_indent is not False, tuple(user_solution))
+            # Deep copy so callers can mutate their result without
+            # poisoning the cache
+            return copy.deepcopy(cached)
+
+        return SharedValidationService._validate_complete_uncached(
+            problem_settings, user_solution, solution_context
+        )
+
+    @staticmethod
+    def validate_batch(
+        problem_settings: Dict[str, Any],
+        solutions: List[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate several submissions against one problem concurrently.
+
+        The work is GIL-bound Python, so the overlap is partial, but the
+        per-solution string scans and the validation-engine IPC release
+        the interpreter often enough for the pool to help on batches.
+        Results are returned in submission order.
+        """
+        if not solutions:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(solutions), os.cpu_count() or 1)) as pool:
+            return list(pool.map(
+                lambda solution: SharedValidationService.validate_solution_complete(
+                    problem_settings, solution
+                ),
+                solutions
+            ))
+
+    @staticmethod
+    def _validate_complete_uncached(
+        problem_settings: Dict[str, Any],
+        user_solution: List[str],
+        solution_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         try:
             # Use the unified validation engine
             result = validation_engine.validate_solution(
@@ -140,7 +250,7 @@ class SharedValidationService:
                     result['solution_length'] / result['expected_length'] 
                     if result['expected_length'] > 0 else 0
                 )
-                print("Added missing solution_length fields to validation result")
+                logger.debug("Added missing solution_length fields to validation result")
             
             # Add indentation fields if missing
             if 'has_indentation_issues' not in result:
@@ -152,12 +262,17 @@ class SharedValidationService:
                 result['indentation_errors'] = indentation_check.get('indentation_errors', [])
                 result['specific_issues'] = result.get('specific_issues', []) + indentation_check.get('specific_issues', [])
                 result['indentation_hint_count'] = len(indentation_check.get('indentation_errors', []))
-                print("Added missing indentation fields to validation result")
+                logger.debug("Added missing indentation fields to validation result")
+
+            # Backward-compatible details string expected by the routers
+            if 'details' not in result:
+                feedback = result.get('feedback') or {}
+                result['details'] = feedback.get('summary', 'Validation completed')
             
             return result
             
         except Exception as e:
-            print(f"Error in unified validation: {e}")
+            logger.debug("Error in unified validation: %s", e)
             # Fallback to basic validation
             result = SharedValidationService._basic_validation(
                 problem_settings, 
@@ -176,7 +291,7 @@ class SharedValidationService:
                     if result['expected_length'] > 0 else 0
                 )
                 
-                print("Added missing solution_length fields to fallback validation result")
+                logger.debug("Added missing solution_length fields to fallback validation result")
                 
             return result
     
@@ -185,34 +300,37 @@ class SharedValidationService:
         """
         Basic validation fallback
         """
-        # Extract correct lines
-        correct_lines = []
-        # Get initial code, handling both dictionary and object access
-        initial_code = (
-            problem_settings.get("initial") if isinstance(problem_settings, dict)
-            else getattr(problem_settings, "initial", "")
-        )
-        
-        for line in initial_code.split('\n'):
-            if line.strip() and '#distractor' not in line:
-                correct_lines.append(line.strip())
-        
-        # Compare with user solution
-        user_lines = [line.strip() for line in user_solution if line.strip()]
-        is_correct = correct_lines == user_lines
-        
-        # Check for indentation issues
-        indentation_analysis = SharedValidationService.check_indentation_consistency(
-            correct_lines, user_solution
-        )
-        
-        # Calculate completion ratio
-        solution_length = len(user_lines)
-        expected_length = len(correct_lines)
+        # Extract correct lines (indentation preserved) and clean the user solution
+        raw_correct_lines = SharedValidationService.extract_correct_lines(problem_settings)
+        raw_user_lines = SharedValidationService.clean_user_solution(user_solution)
+
+        # Compare lengths before doing any per-line work; a length mismatch
+        # (the common "solution incomplete" case) can never be correct
+        solution_length = len(raw_user_lines)
+        expected_length = len(raw_correct_lines)
         completion_ratio = solution_length / expected_length if expected_length > 0 else 0
+
+        if solution_length != expected_length:
+            is_correct = False
+            indentation_analysis = {
+                "has_indentation_issues": False,
+                "indentation_errors": [],
+                "specific_issues": []
+            }
+        else:
+            # Only materialize stripped lists on the equal-length path
+            correct_lines = [line.strip() for line in raw_correct_lines]
+            user_lines = [line.strip() for line in raw_user_lines]
+            is_correct = correct_lines == user_lines
+
+            # Check for indentation issues
+            indentation_analysis = SharedValidationService.check_indentation_consistency(
+                correct_lines, user_solution
+            )
         
         return {
             "isCorrect": is_correct,
+            "details": "Correct!" if is_correct else "Not quite right.",
             "score": 100 if is_correct else 50,
             "errors": [],
             "warnings": [],
@@ -249,33 +367,25 @@ class SharedValidationService:
         Returns:
             Analysis of programming concepts
         """
-        solution_text = ' '.join(user_solution).lower()
-        correct_text = ' '.join(correct_lines).lower()
-        
-        concepts = {
-            "functions": {"keywords": ["def ", "return"], "description": "function definition"},
-            "loops": {"keywords": ["for ", "while "], "description": "iteration/loops"},
-            "conditionals": {"keywords": ["if ", "else", "elif"], "description": "conditional logic"},
-            "variables": {"keywords": ["="], "description": "variable assignment"},
-            "output": {"keywords": ["print("], "description": "output/printing"},
-            "input": {"keywords": ["input("], "description": "user input"},
-            "lists": {"keywords": ["[", "]", ".append", ".extend"], "description": "list operations"},
-            "strings": {"keywords": ["'", '"', ".format", "f'"], "description": "string handling"}
-        }
-        
+        # One scan per text collects every keyword occurrence, replacing
+        # the per-concept, per-keyword substring passes
+        solution_keywords = _keywords_present(' '.join(user_solution).lower())
+        correct_keywords = _keywords_present(' '.join(correct_lines).lower())
+
         missing_concepts = []
         correct_concepts = []
-        
-        for concept, details in concepts.items():
-            has_in_correct = any(keyword in correct_text for keyword in details["keywords"])
-            has_in_user = any(keyword in solution_text for keyword in details["keywords"])
-            
+
+        for concept, details in _CONCEPT_DEFINITIONS.items():
+            keywords = details["keywords"]
+            has_in_correct = any(keyword in correct_keywords for keyword in keywords)
+            has_in_user = any(keyword in solution_keywords for keyword in keywords)
+
             if has_in_correct:
                 if has_in_user:
                     correct_concepts.append(concept)
                 else:
                     missing_concepts.append(concept)
-        
+
         return {
             "missing_concepts": missing_concepts,
             "correct_concepts": correct_concepts
@@ -302,21 +412,29 @@ class SharedValidationService:
             "first_error_position": None
         }
         
-        # Find matching lines
-        for i, user_line in enumerate(user_solution):
-            user_content = user_line.strip()
-            for j, correct_line in enumerate(correct_solution):
-                if user_content == correct_line.strip():
-                    comparison["matching_lines"].append({
-                        "user_pos": i,
-                        "correct_pos": j,
-                        "content": user_content
-                    })
-                    break
-        
+        # Strip each line once, interning so the repeated equality and set
+        # lookups below short-circuit on pointer identity for recurring lines
+        user_stripped = [intern(line.strip()) for line in user_solution]
+        correct_stripped = [intern(line.strip()) for line in correct_solution]
+
+        # Find matching lines: map each distinct correct line to its first
+        # position once, turning the former nested scan into O(n + m)
+        first_correct_pos = {}
+        for j, correct_content in enumerate(correct_stripped):
+            first_correct_pos.setdefault(correct_content, j)
+
+        for i, user_content in enumerate(user_stripped):
+            j = first_correct_pos.get(user_content)
+            if j is not None:
+                comparison["matching_lines"].append({
+                    "user_pos": i,
+                    "correct_pos": j,
+                    "content": user_content
+                })
+
         # Find missing lines
-        user_lines_set = set(line.strip() for line in user_solution)
-        correct_lines_set = set(line.strip() for line in correct_solution)
+        user_lines_set = set(user_stripped)
+        correct_lines_set = set(correct_stripped)
         
         comparison["missing_lines"] = list(correct_lines_set - user_lines_set)
         comparison["extra_lines"] = list(user_lines_set - correct_lines_set)
@@ -334,9 +452,21 @@ class SharedValidationService:
                 })
         
         # Find first error position
-        for i, (user_line, correct_line) in enumerate(zip(user_solution, correct_solution)):
-            if user_line.strip() != correct_line.strip():
+        for i, (user_content, correct_content) in enumerate(zip(user_stripped, correct_stripped)):
+            if user_content != correct_content:
                 comparison["first_error_position"] = i
                 break
         
         return comparison
+
+
+@lru_cache(maxsize=1024)
+def _validate_complete_cached(initial: str, can_indent: bool, user_tuple: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Content-keyed cache for context-free validations.
+
+    Keyed on the initial code and the user's lines rather than object
+    identity, so retries and identical submissions hit the cache.
+    """
+    settings = {"initial": initial, "options": {"can_indent": can_indent}}
+    return SharedValidationService._validate_complete_uncached(settings, list(user_tuple), None)
@@ -1,26 +1,42 @@
 from typing import Dict, List, Any, Optional
 from .shared_validation import SharedValidationService
 
+# Canonical result keys, used to pad a frontend-supplied context into a
+# full validation result without re-running any validation
+_DEFAULT_FIELDS = {
+    "isCorrect": False,
+    "details": "",
+    "has_indentation_issues": False,
+    "indentation_errors": [],
+    "completion_ratio": 0.0,
+}
+
 def validate_solution(
-    problem_settings: Dict[str, Any], 
+    problem_settings: Dict[str, Any],
     user_solution: List[str],
     solution_context: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Validates if the user's solution matches the expected correct solution.
     Now uses the shared validation service for consistent validation logic.
-    
+
     Args:
         problem_settings: The ParsonsSettings of the problem
         user_solution: The user's submitted solution as a list of code lines
         solution_context: Optional frontend validation context
-    
+
     Returns:
         A SolutionValidation object with isCorrect flag and optional details
     """
+    # Fast path: when the frontend already validated, trust its verdict
+    # and skip the distractor scan and indentation checks entirely
+    if solution_context and "isCorrect" in solution_context:
+        # Fresh error list per result so callers can't mutate the shared default
+        return {**_DEFAULT_FIELDS, "indentation_errors": [], **solution_context}
+
     # Use the shared validation service for consistent validation
     return SharedValidationService.validate_solution_complete(
         problem_settings=problem_settings,
         user_solution=user_solution,
         solution_context=solution_context
-    )
\ No newline at end of file
+    )
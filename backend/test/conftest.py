@@ -0,0 +1,26 @@
+"""
+Shared fixtures for the backend test suite.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Make the backend package importable regardless of where pytest is invoked
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.shared_validation import SharedValidationService
+
+
+@pytest.fixture(scope="module")
+def factorial_problem():
+    """
+    The factorial Parsons problem used across the integration tests,
+    parsed once per module: returns (problem_settings, correct_lines).
+    """
+    problem_settings = {
+        "initial": "def calculate_factorial(n):\n    if n <= 1:\n        return 1\n    else:\n        return n * calculate_factorial(n-1)\n    print('extra') #distractor"
+    }
+    correct_lines = SharedValidationService.extract_correct_lines(problem_settings)
+    return problem_settings, correct_lines
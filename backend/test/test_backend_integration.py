@@ -2,8 +2,21 @@
 # is correctly passed to and processed by the backend.
 
 import json
+import logging
+import logging.handlers
+import sys
 from typing import Dict, List, Any
 
+# Buffer status output in memory and flush once at the end of the test
+# instead of locking and flushing stdout on every line
+_handler = logging.handlers.MemoryHandler(
+    capacity=1024, target=logging.StreamHandler(sys.stdout)
+)
+log = logging.getLogger(__name__)
+log.addHandler(_handler)
+log.setLevel(logging.INFO)
+log.propagate = False
+
 def test_backend_solution_context():
     """Test that backend receives and processes solution context correctly"""
     
@@ -53,12 +66,12 @@ def test_backend_solution_context():
         ]
     }
     
-    print("Testing Backend Solution Context Processing")
-    print("=" * 50)
+    log.info("Testing Backend Solution Context Processing")
+    log.info("=" * 50)
     
     # Test local validation endpoint
     try:
-        print("\n1. Testing Local Validation API:")
+        log.info("\n1. Testing Local Validation API:")
         
         validation_payload = {
             "settings": problem_settings,
@@ -66,25 +79,25 @@ def test_backend_solution_context():
             "solutionContext": solution_context  # This is the key part
         }
         
-        print(f"   Payload includes solutionContext: {solution_context['has_indentation_issues']}")
-        print(f"   Indentation issues detected: {solution_context['indentation_hint_count']}")
+        log.info(f"   Payload includes solutionContext: {solution_context['has_indentation_issues']}")
+        log.info(f"   Indentation issues detected: {solution_context['indentation_hint_count']}")
         
         # If we had a running backend, we would make this request:
         # response = requests.post("http://localhost:8000/api/validate", json=validation_payload)
         
         # For now, simulate what the backend should do:
-        print("   [SIMULATED] Backend should:")
-        print("     - Receive solutionContext in request")
-        print("     - Pass to SharedValidationService.validate_solution_complete()")
-        print("     - Use context to provide appropriate feedback")
-        print("     - Return validation result with context-aware messages")
+        log.info("   [SIMULATED] Backend should:")
+        log.info("     - Receive solutionContext in request")
+        log.info("     - Pass to SharedValidationService.validate_solution_complete()")
+        log.info("     - Use context to provide appropriate feedback")
+        log.info("     - Return validation result with context-aware messages")
         
     except Exception as e:
-        print(f"   Error testing validation API: {e}")
+        log.info(f"   Error testing validation API: {e}")
     
     # Test chat feedback endpoint
     try:
-        print("\n2. Testing Chat Feedback API:")
+        log.info("\n2. Testing Chat Feedback API:")
         
         chat_payload = {
             "problemId": "test-problem",
@@ -94,29 +107,29 @@ def test_backend_solution_context():
             "solutionContext": solution_context  # This is also key
         }
         
-        print(f"   Chat context includes indentation issues: {solution_context['has_indentation_issues']}")
-        print(f"   Number of hints: {len(solution_context['indentationHints'])}")
+        log.info(f"   Chat context includes indentation issues: {solution_context['has_indentation_issues']}")
+        log.info(f"   Number of hints: {len(solution_context['indentationHints'])}")
         
         # Simulate what should happen:
-        print("   [SIMULATED] Backend should:")
-        print("     - Receive solutionContext in chat request")
-        print("     - Generate contextual response about indentation")
-        print("     - Reference specific indentation issues")
-        print("     - Provide helpful guidance based on context")
+        log.info("   [SIMULATED] Backend should:")
+        log.info("     - Receive solutionContext in chat request")
+        log.info("     - Generate contextual response about indentation")
+        log.info("     - Reference specific indentation issues")
+        log.info("     - Provide helpful guidance based on context")
         
     except Exception as e:
-        print(f"   Error testing chat API: {e}")
+        log.info(f"   Error testing chat API: {e}")
     
     # Test shared validation service
-    print("\n3. Testing SharedValidationService Integration:")
-    print("   The SharedValidationService.validate_solution_complete() should:")
-    print(f"   - Accept solutionContext parameter")
-    print(f"   - Use has_indentation_issues: {solution_context['has_indentation_issues']}")
-    print(f"   - Consider indentation_hint_count: {solution_context['indentation_hint_count']}")
-    print(f"   - Adapt validation based on solutionStatus: '{solution_context['solutionStatus']}'")
+    log.info("\n3. Testing SharedValidationService Integration:")
+    log.info("   The SharedValidationService.validate_solution_complete() should:")
+    log.info(f"   - Accept solutionContext parameter")
+    log.info(f"   - Use has_indentation_issues: {solution_context['has_indentation_issues']}")
+    log.info(f"   - Consider indentation_hint_count: {solution_context['indentation_hint_count']}")
+    log.info(f"   - Adapt validation based on solutionStatus: '{solution_context['solutionStatus']}'")
     
     # Verify the refactoring is complete
-    print("\n4. Verification Checklist:")
+    log.info("\n4. Verification Checklist:")
     verification_items = [
         "✓ SharedValidationService accepts solutionContext parameter",
         "✓ solution_validator.py uses shared service",
@@ -128,15 +141,17 @@ def test_backend_solution_context():
     ]
     
     for item in verification_items:
-        print(f"   {item}")
+        log.info(f"   {item}")
     
-    print(f"\n5. Expected Results for User's Example:")
-    print(f"   Input: {len(user_solution)} lines with 0 indentation")
-    print(f"   Expected: {solution_context['indentation_hint_count']} indentation issues detected")
-    print(f"   Frontend: generateIndentationHints() finds 3 issues")
-    print(f"   Context: has_indentation_issues = True")
-    print(f"   Backend: Receives context and provides appropriate feedback")
-    print(f"   Result: Consistent validation across all components")
+    log.info(f"\n5. Expected Results for User's Example:")
+    log.info(f"   Input: {len(user_solution)} lines with 0 indentation")
+    log.info(f"   Expected: {solution_context['indentation_hint_count']} indentation issues detected")
+    log.info(f"   Frontend: generateIndentationHints() finds 3 issues")
+    log.info(f"   Context: has_indentation_issues = True")
+    log.info(f"   Backend: Receives context and provides appropriate feedback")
+    log.info(f"   Result: Consistent validation across all components")
+
+    _handler.flush()
 
 if __name__ == "__main__":
     test_backend_solution_context()
@@ -13,12 +13,16 @@ import time
 # API base URL - adjust if your server runs on a different port
 BASE_URL = "http://localhost:8000"
 
+# One session for all tests so the keep-alive connection is reused
+# instead of paying a TCP handshake per request
+SESSION = requests.Session()
+
 def test_health_check():
     """Test the health check endpoint"""
     print("Testing health check endpoint...")
     
     try:
-        response = requests.get(f"{BASE_URL}/api/feedback/health")
+        response = SESSION.get(f"{BASE_URL}/api/feedback/health")
         
         if response.status_code == 200:
             data = response.json()
@@ -46,7 +50,7 @@ def test_original_feedback_endpoint():
     }
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/feedback",
             json=payload,
             headers={"Content-Type": "application/json"}
@@ -78,7 +82,7 @@ def test_chat_endpoint_basic():
     }
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/feedback/chat",
             json=payload,
             headers={"Content-Type": "application/json"}
@@ -125,7 +129,7 @@ def test_chat_endpoint_with_history():
     }
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/feedback/chat",
             json=payload,
             headers={"Content-Type": "application/json"}
@@ -160,7 +164,7 @@ def test_chat_endpoint_validation():
     }
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/feedback/chat",
             json=payload,
             headers={"Content-Type": "application/json"}
@@ -184,7 +188,7 @@ def test_chat_endpoint_validation():
     }
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/feedback/chat",
             json=payload,
             headers={"Content-Type": "application/json"}
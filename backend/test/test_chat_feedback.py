@@ -4,9 +4,11 @@ Test script for validating the chat feedback functionality
 Run with: python test_chat_feedback.py
 """
 
+import asyncio
 import sys
 import os
 from datetime import datetime
+from unittest import mock
 
 # Add the backend directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -14,6 +16,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from services.feedback_generator import (
     generate_feedback,
     generate_chat_response,
+    generate_chat_response_async,
     analyze_solution_state,
     build_conversation_context,
     generate_chat_fallback
@@ -105,7 +108,11 @@ def test_chat_fallback():
 
   print("Chat fallback tests passed!\n")
 
-def test_generate_chat_response():
+@mock.patch(
+    "services.feedback_generator.get_openai_response",
+    return_value="Mocked tutor response: think about what should run first."
+)
+def test_generate_chat_response(mock_openai):
   """Test the main chat response generation"""
   print("Testing generate_chat_response...")
   problem_settings = {
@@ -151,7 +158,11 @@ def test_generate_chat_response():
       print("Chat response generation tests completed!\n")
       return True
 
-def test_comprehensive_scenario():
+@mock.patch(
+    "services.feedback_generator.get_openai_response",
+    return_value="Mocked tutor response: think about what should run first."
+)
+def test_comprehensive_scenario(mock_openai):
   """Test a complete conversation scenario"""
   print("Testing comprehensive conversation scenario...")
   problem_settings = {
@@ -186,33 +197,44 @@ def test_comprehensive_scenario():
     }
   ]
 
-  for i, scenario in enumerate(scenarios):
+  # The scenarios are independent, so fan them out concurrently and let
+  # their OpenAI round-trips overlap instead of running back to back
+  async def run_scenarios():
+      return await asyncio.gather(
+          *(
+              generate_chat_response_async(
+                  problem_settings,
+                  scenario["user_solution"],
+                  scenario["chat_history"],
+                  scenario["message"]
+              )
+              for scenario in scenarios
+          ),
+          return_exceptions=True
+      )
+
+  responses = asyncio.run(run_scenarios())
+
+  for i, (scenario, response) in enumerate(zip(scenarios, responses)):
       print(f"  Scenario {i+1}: {scenario['expected_topic']}")
-      try:
-          response = generate_chat_response(
-              problem_settings,
-              scenario["user_solution"],
-              scenario["chat_history"],
-              scenario["message"]
-          )
-          print(f"    ✓ Response: {response[:50]}...")
-      except Exception as e:
+      if isinstance(response, BaseException):
           # Use fallback for testing
           response = generate_chat_fallback(
-              scenario["message"], 
-              scenario["user_solution"], 
+              scenario["message"],
+              scenario["user_solution"],
               problem_settings
           )
           print(f"    ✓ Fallback response: {response[:50]}...")
+      else:
+          print(f"    ✓ Response: {response[:50]}...")
 
   print("Comprehensive scenario tests passed!\n")
 
 
 if __name__ == "__main__":
-  print("=" * 60)
-  print("TESTING CHAT FEEDBACK FUNCTIONALITY")
-  print("=" * 60 )
-  
+  # Static banner written in one call rather than line-by-line prints
+  sys.stdout.write("\n".join(["=" * 60, "TESTING CHAT FEEDBACK FUNCTIONALITY", "=" * 60, ""]))
+
   all_passed = True
 
   try:
@@ -5,6 +5,16 @@ is correctly detected on the frontend and properly processed by the backend.
 """
 
 import json
+import re
+from sys import intern
+
+# Matches the leading indent; .end() gives its width without allocating
+# the stripped copy that len(line) - len(line.lstrip()) would
+_IND = re.compile(r"[ \t]*").match
+
+def _indents(lines):
+    """Indent level (in 4-space units) of each line, computed in one pass"""
+    return [_IND(line).end() >> 2 for line in lines]
 
 def test_indentation_example_full_flow():
     """Test the complete flow for the user's specific indentation example"""
@@ -21,9 +31,9 @@ def test_indentation_example_full_flow():
         "for j in range(cols):",
         "print(f\"({i}, {j})\")"
     ]
+    user_indents = _indents(user_solution)
     for i, line in enumerate(user_solution, 1):
-        indent_level = (len(line) - len(line.lstrip())) // 4
-        print(f"   Line {i}: '{line}' (indent: {indent_level})")
+        print(f"   Line {i}: '{line}' (indent: {user_indents[i - 1]})")
     
     # 2. CORRECT SOLUTION
     print("\n2. CORRECT SOLUTION:")
@@ -33,9 +43,9 @@ def test_indentation_example_full_flow():
         "        for j in range(cols):",
         "            print(f\"({i}, {j})\")"
     ]
+    correct_indents = _indents(correct_solution)
     for i, line in enumerate(correct_solution, 1):
-        indent_level = (len(line) - len(line.lstrip())) // 4
-        print(f"   Line {i}: '{line}' (indent: {indent_level})")
+        print(f"   Line {i}: '{line}' (indent: {correct_indents[i - 1]})")
     
     # 3. FRONTEND DETECTION (generateIndentationHints)
     print("\n3. FRONTEND INDENTATION DETECTION:")
@@ -44,17 +54,17 @@ def test_indentation_example_full_flow():
     frontend_hints = []
     correct_indent_map = {}
     
-    # Build correct indentation map
-    for line in correct_solution:
+    # Build correct indentation map from the precomputed indents; keys are
+    # interned so the lookups below hit the pointer-equality fast path
+    for line, indent_level in zip(correct_solution, correct_indents):
         content = line.strip()
         if content and not content.startswith('#'):
-            indent_level = (len(line) - len(line.lstrip())) // 4
-            correct_indent_map[content] = indent_level
+            correct_indent_map[intern(content)] = indent_level
     
     # Check user solution against correct
     for index, user_line in enumerate(user_solution):
-        user_content = user_line.strip()
-        user_indent = (len(user_line) - len(user_line.lstrip())) // 4
+        user_content = intern(user_line.strip())
+        user_indent = user_indents[index]
         
         if user_content in correct_indent_map:
             expected_indent = correct_indent_map[user_content]
@@ -2,6 +2,28 @@
 # for the specific example provided by the user.
 
 import json
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from sys import intern
+
+# Pretty-printing goes through orjson's native encoder when available;
+# the stdlib pure-Python encoder is the fallback
+try:
+    import orjson
+
+    def _dumps_pretty(obj, default):
+        # PASSTHROUGH_DATACLASS routes IndentHint through default so the
+        # wire payload (with the lazy hint text) is what gets dumped
+        return orjson.dumps(
+            obj,
+            default=default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS
+        ).decode('utf-8')
+except ImportError:
+    def _dumps_pretty(obj, default):
+        return json.dumps(obj, indent=2, default=default)
 
 # User's solution code (incorrect - missing indentation)
 user_solution = [
@@ -21,126 +43,202 @@ correct_solution = [
 
 def get_indent_level(line):
     """Get indentation level (number of leading spaces / 4)"""
-    leading_spaces = len(line) - len(line.lstrip())
-    return leading_spaces // 4
+    # lstrip(' ') scans only for spaces instead of the full whitespace set
+    leading_spaces = len(line) - len(line.lstrip(' '))
+    return leading_spaces >> 2
+
+# Matches every line's run of leading spaces in one multiline pass
+_LEADING_SPACES = re.compile(r'^( *)', re.M)
+
+@lru_cache(maxsize=256)
+def _build_correct_map(correct_tuple):
+    """Map of correct line content to expected indent, built once per problem"""
+    # One findall over the joined text replaces a per-line lstrip pass
+    indents = _LEADING_SPACES.findall('\n'.join(correct_tuple))
+    correct_indent_map = {}
+    for line, leading in zip(correct_tuple, indents):
+        # Interned keys let the student-loop lookups take the
+        # pointer-equality fast path
+        content = intern(line.strip())
+        if content and not content.startswith('#'):
+            correct_indent_map[content] = len(leading) >> 2
+    return correct_indent_map
+
+# Context hints dispatched on the line's first token (up to the first
+# space or opening paren) so one dict lookup replaces the cascaded
+# startswith checks; the ':' suffix keeps priority over all of these
+_CONTEXT_HINTS = {
+    'for': ' Code inside this loop should be indented relative to this line.',
+    'while': ' Code inside this loop should be indented relative to this line.',
+    'print(': ' Print statements are usually inside functions or loops.',
+}
+
+@dataclass(slots=True)
+class IndentHint:
+    """
+    One detected indentation mismatch. The human-readable message is
+    built lazily on first .hint access - count-only consumers such as
+    create_solution_context never pay for the string formatting.
+
+    slots=True drops the per-instance __dict__, shrinking each hint to
+    a few machine words; dict conversion happens only in _hint_payload
+    at the serialization boundary.
+    """
+    lineIndex: int
+    currentIndent: int
+    expectedIndent: int
+    content: str
+
+    @property
+    def hint(self):
+        indent_diff = self.expectedIndent - self.currentIndent
+        magnitude = abs(indent_diff)
+        direction = 'more' if indent_diff > 0 else 'fewer'
+
+        # Collect the segments and join once, instead of growing the
+        # message with repeated concatenation
+        parts = [
+            f'Line {self.lineIndex + 1} "{self.content}" should be indented '
+            f'{magnitude} {direction} level{"s" if magnitude > 1 else ""}.'
+        ]
+
+        # Add context-specific hints
+        if self.content.endswith(':'):
+            parts.append(' Lines ending with ":" introduce new code blocks.')
+        else:
+            head = self.content.split(' ', 1)[0]
+            paren = head.find('(')
+            if paren != -1:
+                head = head[:paren + 1]
+            context = _CONTEXT_HINTS.get(head)
+            if context:
+                parts.append(context)
+        return ''.join(parts)
 
 def generate_indentation_hints(student_solution, correct_solution):
     """
     Simulate the frontend generateIndentationHints function
     """
     hints = []
-    
-    # Create a map of correct content to expected indentation
-    correct_indent_map = {}
-    for line in correct_solution:
-        content = line.strip()
-        if content and not content.startswith('#'):
-            correct_indent_map[content] = get_indent_level(line)
-    
+
+    # The map of correct content to expected indentation rarely changes
+    # between submissions, so it is cached on the (hashable) line tuple.
+    # Callers treat it as read-only. The bound methods skip the
+    # per-iteration attribute lookups in the loop below.
+    expected_indent_for = _build_correct_map(tuple(correct_solution)).get
+    record_hint = hints.append
+
+    # Extract per-line data in comprehension passes up front so the
+    # analysis loop only does map lookups and mismatch formatting
+    student_contents = [intern(line.strip()) for line in student_solution]
+    student_indents = [get_indent_level(line) for line in student_solution]
+
     # Analyze student solution line by line
-    for index, student_line in enumerate(student_solution):
-        student_content = student_line.strip()
-        student_indent = get_indent_level(student_line)
-        
+    for index, student_content in enumerate(student_contents):
         if not student_content:
             continue  # Skip empty lines
-            
-        expected_indent = correct_indent_map.get(student_content)
-        
+
+        student_indent = student_indents[index]
+        expected_indent = expected_indent_for(student_content)
+
         if expected_indent is not None and student_indent != expected_indent:
-            indent_diff = expected_indent - student_indent
-            
-            if indent_diff > 0:
-                hint = f'Line {index + 1} "{student_content}" should be indented {indent_diff} more level{"s" if indent_diff > 1 else ""}.'
-            else:
-                hint = f'Line {index + 1} "{student_content}" should be indented {abs(indent_diff)} fewer level{"s" if abs(indent_diff) > 1 else ""}.'
-            
-            # Add context-specific hints
-            if student_content.endswith(':'):
-                hint += ' Lines ending with ":" introduce new code blocks.'
-            elif student_content.startswith('for ') or student_content.startswith('while '):
-                hint += ' Code inside this loop should be indented relative to this line.'
-            elif student_content.startswith('print('):
-                hint += ' Print statements are usually inside functions or loops.'
-            
-            hints.append({
-                'lineIndex': index,
-                'currentIndent': student_indent,
-                'expectedIndent': expected_indent,
-                'hint': hint
-            })
-    
+            record_hint(IndentHint(index, student_indent, expected_indent, student_content))
+
     return hints
 
 def create_solution_context(is_correct, indentation_hints):
     """
     Simulate the frontend solution context creation
     """
+    # Count once; the three derived fields reuse it
+    hint_count = len(indentation_hints)
+    has_issues = hint_count > 0
     return {
         'isCorrect': is_correct,
         'indentationHints': indentation_hints,
-        'solutionStatus': 'indentation-issues' if len(indentation_hints) > 0 else ('correct' if is_correct else 'incorrect'),
-        'has_indentation_issues': len(indentation_hints) > 0,
-        'indentation_hint_count': len(indentation_hints)
+        'solutionStatus': 'indentation-issues' if has_issues else ('correct' if is_correct else 'incorrect'),
+        'has_indentation_issues': has_issues,
+        'indentation_hint_count': hint_count
+    }
+
+def _hint_payload(hint):
+    """Wire-format dict for an IndentHint, matching the frontend shape"""
+    return {
+        'lineIndex': hint.lineIndex,
+        'currentIndent': hint.currentIndent,
+        'expectedIndent': hint.expectedIndent,
+        'hint': hint.hint,
     }
 
 def main():
-    print("Testing Indentation Detection for User's Example")
-    print("=" * 60)    
-    print("\nUser's Solution (Incorrect):")
+    # Accumulate the report and emit it in one write at the end instead
+    # of dozens of print calls
+    out = []
+    W = out.append
+
+    W("Testing Indentation Detection for User's Example")
+    W("=" * 60)
+    W("\nUser's Solution (Incorrect):")
     for i, line in enumerate(user_solution, 1):
-        print(f"  {i}: '{line}' (indent: {get_indent_level(line)})")    
-    print("\nCorrect Solution:")
+        W(f"  {i}: '{line}' (indent: {get_indent_level(line)})")
+    W("\nCorrect Solution:")
     for i, line in enumerate(correct_solution, 1):
-        print(f"  {i}: '{line}' (indent: {get_indent_level(line)})")    
-    print("\nRunning Indentation Detection...")
-    
+        W(f"  {i}: '{line}' (indent: {get_indent_level(line)})")
+    W("\nRunning Indentation Detection...")
+
     # Generate indentation hints
-    hints = generate_indentation_hints(user_solution, correct_solution)    
-    print(f"\nDetection Results:")
-    print(f"  Found {len(hints)} indentation issues")
-    
+    hints = generate_indentation_hints(user_solution, correct_solution)
+    W(f"\nDetection Results:")
+    W(f"  Found {len(hints)} indentation issues")
+
     for hint in hints:
-        print(f"  - Line {hint['lineIndex'] + 1}: Current={hint['currentIndent']}, Expected={hint['expectedIndent']}")
-        print(f"    Hint: {hint['hint']}")
-    
+        W(f"  - Line {hint.lineIndex + 1}: Current={hint.currentIndent}, Expected={hint.expectedIndent}")
+        W(f"    Hint: {hint.hint}")
+
     # Create solution context
-    solution_context = create_solution_context(False, hints)    
-    print(f"\nSolution Context for Backend:")
-    print(json.dumps(solution_context, indent=2))
-    
-    # Verify expected results    
-    print(f"\nVerification:")
+    solution_context = create_solution_context(False, hints)
+    W(f"\nSolution Context for Backend:")
+    # Hints materialize their message text only here, at the
+    # serialization boundary
+    W(_dumps_pretty(solution_context, default=_hint_payload))
+
+    # Verify expected results
+    W(f"\nVerification:")
     expected_issues = 3  # Lines 2, 3, 4 should have indentation issues
-    if len(hints) == expected_issues:        print(f"  [OK] Correctly detected {expected_issues} indentation issues")
+    if len(hints) == expected_issues:
+        W(f"  [OK] Correctly detected {expected_issues} indentation issues")
     else:
-        print(f"  [ERROR] Expected {expected_issues} issues, but found {len(hints)}")
-    
+        W(f"  [ERROR] Expected {expected_issues} issues, but found {len(hints)}")
+
     # Check specific lines
     expected_indents = [0, 1, 2, 3]  # def, for, for, print
     for i, expected in enumerate(expected_indents):
         actual = get_indent_level(user_solution[i])
-        if actual != expected:            print(f"  [OK] Line {i+1} correctly identified: actual={actual}, expected={expected}")
+        if actual != expected:
+            W(f"  [OK] Line {i+1} correctly identified: actual={actual}, expected={expected}")
         else:
-            print(f"  [ERROR] Line {i+1} should be wrong but appears correct")
-    
+            W(f"  [ERROR] Line {i+1} should be wrong but appears correct")
+
     # Verify solution context flags
-    if solution_context['has_indentation_issues']:        print(f"  [OK] Solution context correctly flags indentation issues")
+    if solution_context['has_indentation_issues']:
+        W(f"  [OK] Solution context correctly flags indentation issues")
     else:
-        print(f"  [ERROR] Solution context should flag indentation issues")
-    
+        W(f"  [ERROR] Solution context should flag indentation issues")
+
     if solution_context['solutionStatus'] == 'indentation-issues':
-        print(f"  [OK] Solution status correctly set to 'indentation-issues'")
+        W(f"  [OK] Solution status correctly set to 'indentation-issues'")
     else:
-        print(f"  [ERROR] Solution status should be 'indentation-issues', got '{solution_context['solutionStatus']}'")
-    
-    print(f"\nExpected Backend Behavior:")
-    print(f"  - SharedValidationService should receive solutionContext with:")
-    print(f"    - has_indentation_issues: True")
-    print(f"    - indentation_hint_count: {len(hints)}")
-    print(f"    - solutionStatus: 'indentation-issues'")
-    print(f"  - Backend should provide contextual feedback about indentation")
-    print(f"  - All validation components should use this shared context")
+        W(f"  [ERROR] Solution status should be 'indentation-issues', got '{solution_context['solutionStatus']}'")
+
+    W(f"\nExpected Backend Behavior:")
+    W(f"  - SharedValidationService should receive solutionContext with:")
+    W(f"    - has_indentation_issues: True")
+    W(f"    - indentation_hint_count: {len(hints)}")
+    W(f"    - solutionStatus: 'indentation-issues'")
+    W(f"  - Backend should provide contextual feedback about indentation")
+    W(f"  - All validation components should use this shared context")
+
+    sys.stdout.write('\n'.join(out) + '\n')
 
 if __name__ == "__main__":
     main()
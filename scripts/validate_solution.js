@@ -7,6 +7,7 @@
 
 const fs = require('fs');
 const path = require('path');
+const readline = require('readline');
 
 // Import the validation engine (this would need proper bundling in real implementation)
 // For now, we'll use a simplified approach
@@ -17,12 +18,15 @@ async function validateSolution() {
       throw new Error('Input file path required');
     }
 
-    // Read input
-    const inputData = JSON.parse(fs.readFileSync(inputFile, 'utf8'));
+    // Read input from stdin ('-') or from a file path
+    const raw = inputFile === '-'
+      ? fs.readFileSync(0, 'utf8')
+      : fs.readFileSync(inputFile, 'utf8');
+    const inputData = JSON.parse(raw);
 
     // Here we would import and use the actual ValidationEngine
     // For this implementation plan, we'll simulate the result
-    const result = await simulateValidation(inputData);
+    const result = await handleRequest(inputData);
 
     // Output result
     console.log(JSON.stringify(result));
@@ -37,6 +41,103 @@ async function validateSolution() {
   }
 }
 
+/**
+ * Long-running worker mode: one JSON request per stdin line,
+ * one JSON response per stdout line. Spawned once by the Python
+ * bridge so Node startup cost is paid a single time.
+ */
+function serve() {
+  const rl = readline.createInterface({ input: process.stdin, terminal: false });
+
+  rl.on('line', async (line) => {
+    if (!line.trim()) {
+      return;
+    }
+    try {
+      const result = await handleRequest(JSON.parse(line));
+      process.stdout.write(JSON.stringify(result) + '\n');
+    } catch (error) {
+      process.stdout.write(JSON.stringify({ error: error.message }) + '\n');
+    }
+  });
+
+  rl.on('close', () => process.exit(0));
+}
+
+/**
+ * Socket worker mode: serves validation requests over a Unix domain
+ * socket (or named pipe on Windows). Messages are framed with a 4-byte
+ * big-endian length prefix so neither side has to scan for delimiters.
+ */
+function serveSocket(socketPath) {
+  const net = require('net');
+
+  try {
+    fs.unlinkSync(socketPath);
+  } catch (error) {
+    // Socket file did not exist yet
+  }
+
+  const server = net.createServer((sock) => {
+    let buffer = Buffer.alloc(0);
+    let busy = Promise.resolve();
+
+    sock.on('data', (chunk) => {
+      buffer = Buffer.concat([buffer, chunk]);
+      while (buffer.length >= 4) {
+        const length = buffer.readUInt32BE(0);
+        if (buffer.length < 4 + length) {
+          break;
+        }
+        const payload = buffer.subarray(4, 4 + length).toString('utf8');
+        buffer = buffer.subarray(4 + length);
+        // Chain responses so they go out in request order
+        busy = busy.then(async () => {
+          let response;
+          try {
+            response = await handleRequest(JSON.parse(payload));
+          } catch (error) {
+            response = { error: error.message };
+          }
+          const body = Buffer.from(JSON.stringify(response), 'utf8');
+          const header = Buffer.alloc(4);
+          header.writeUInt32BE(body.length, 0);
+          sock.write(Buffer.concat([header, body]));
+        });
+      }
+    });
+  });
+
+  server.listen(socketPath);
+
+  const cleanup = () => {
+    try {
+      fs.unlinkSync(socketPath);
+    } catch (error) {
+      // Already removed
+    }
+    process.exit(0);
+  };
+  process.on('SIGTERM', cleanup);
+  process.on('SIGINT', cleanup);
+}
+
+/**
+ * Dispatch a single validation request or a batch.
+ * Batches arrive as { batch: [input, ...] } and return
+ * { results: [result, ...] } in the same order.
+ */
+async function handleRequest(input) {
+  if (input && Array.isArray(input.batch)) {
+    const results = [];
+    for (const item of input.batch) {
+      results.push(await simulateValidation(item));
+    }
+    return { results };
+  }
+  return simulateValidation(input);
+}
+
 async function simulateValidation(input) {
   // This would use the actual ValidationEngine
   // return validationEngine.validate(input);
@@ -63,4 +164,10 @@ async function simulateValidation(input) {
   };
 }
 
-validateSolution();
+if (process.argv[2] === '--serve') {
+  serve();
+} else if (process.argv[2] === '--serve-socket') {
+  serveSocket(process.argv[3]);
+} else {
+  validateSolution();
+}